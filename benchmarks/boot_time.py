@@ -0,0 +1,57 @@
+"""
+Measure how long a fresh worker takes to boot: interpreter start, Django
+setup, WSGI application and URLconf (which imports every view module).
+
+Usage:
+    python benchmarks/boot_time.py [--runs 20] [--cold-start]
+
+Each run is a separate interpreter so nothing is shared through sys.modules.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+
+BOOT_SNIPPET = """
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+
+application = get_wsgi_application()
+get_resolver().url_patterns
+"""
+
+
+def boot_once(env):
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-c', BOOT_SNIPPET], cwd=SRC_DIR, env=env, check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--cold-start', action='store_true', help='Boot with COLD_START_MODE=1')
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'settings.local')
+    env['PYTHONPATH'] = str(SRC_DIR)
+    env['COLD_START_MODE'] = '1' if args.cold_start else '0'
+
+    # Warm the filesystem cache and bytecode before timing
+    boot_once(env)
+    timings = sorted(boot_once(env) for _ in range(args.runs))
+
+    print(f"COLD_START_MODE={env['COLD_START_MODE']} runs={args.runs}")
+    print(f"  min    {timings[0]:8.1f} ms")
+    print(f"  median {statistics.median(timings):8.1f} ms")
+    print(f"  p90    {timings[int(len(timings) * 0.9) - 1]:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
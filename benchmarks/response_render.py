@@ -0,0 +1,121 @@
+"""
+Compare per-request CPU of the chat response paths before and after the
+lean output path: re-validating through serializers and rendering with DRF's
+JSONRenderer versus plain dicts rendered with ORJSONRenderer.
+
+Usage:
+    python benchmarks/response_render.py [--messages 5000] [--repeat 20]
+
+No database is needed: history rows are built in memory, as model instances
+for the old path and as the dicts `.values()` returns for the new one.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+sys.path.insert(0, str(SRC_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'settings.local')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from aws_llm.models import ChatMessage  # noqa: E402
+from aws_llm.serializers import ChatResponseSerializer  # noqa: E402
+from main.renderers import ORJSONRenderer  # noqa: E402
+
+
+def build_rows(count):
+    started = timezone.now()
+    rows = []
+    for i in range(count):
+        rows.append((
+            i + 1,
+            'user' if i % 2 == 0 else 'assistant',
+            f"Message number {i} with some typical chat length content. " * 4,
+            started + timedelta(seconds=i),
+        ))
+    return rows
+
+
+def history_before(rows):
+    # Model instances (what iterating the queryset built) formatted one by one
+    messages = [ChatMessage(id=i, role=role, message=text, created_at=ts) for i, role, text, ts in rows]
+    message_data = []
+    for msg in messages:
+        message_data.append({
+            'id': msg.id,
+            'role': msg.role,
+            'content': msg.message,
+            'timestamp': msg.created_at,
+        })
+    return JSONRenderer().render({'conversation': {'messages': message_data}, 'success': True})
+
+
+def history_after(rows):
+    # Dicts in the shape `.values(...)` hands back
+    message_data = [
+        {'id': i, 'role': role, 'content': text, 'timestamp': ts}
+        for i, role, text, ts in rows
+    ]
+    return ORJSONRenderer().render({'conversation': {'messages': message_data}, 'success': True})
+
+
+def chat_before(text):
+    serializer = ChatResponseSerializer(data={
+        'response': text,
+        'model_used': 'gemma2:2b',
+        'timestamp': timezone.now(),
+        'success': True,
+    })
+    serializer.is_valid()
+    return JSONRenderer().render(serializer.data)
+
+
+def chat_after(text):
+    return ORJSONRenderer().render({
+        'response': text,
+        'model_used': 'gemma2:2b',
+        'timestamp': timezone.now(),
+        'success': True,
+    })
+
+
+def cpu_ms(func, arg, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.process_time()
+        func(arg)
+        best = min(best, time.process_time() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rows = build_rows(args.messages)
+    text = rows[1][2]
+
+    for name, before, after, arg, repeat in (
+        (f'history ({args.messages} messages)', history_before, history_after, rows, args.repeat),
+        ('chat response', chat_before, chat_after, text, args.repeat * 100),
+    ):
+        before_ms = cpu_ms(before, arg, repeat)
+        after_ms = cpu_ms(after, arg, repeat)
+        print(f"{name}")
+        print(f"  before {before_ms:9.3f} ms")
+        print(f"  after  {after_ms:9.3f} ms  ({before_ms / after_ms:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
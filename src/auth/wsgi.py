@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'auth.settings')
 
 application = get_wsgi_application()
+
+# Only server processes load this module (runserver's autoreloader only in
+# its serving child), so management commands never warm up models
+from aws_llm.utils.warmup import start_warmup  # noqa: E402
+
+start_warmup()
@@ -1,8 +1,10 @@
 from django.contrib import admin
 
-from aws_llm.models import ChatConversation, ChatMessage
+from aws_llm.models import ChatConversation, ChatMessage, DailyUsageRollup, HourlyUsageRollup
 
 # Register your models here.
 
 admin.site.register(ChatConversation)
-admin.site.register(ChatMessage)
\ No newline at end of file
+admin.site.register(ChatMessage)
+admin.site.register(HourlyUsageRollup)
+admin.site.register(DailyUsageRollup)
\ No newline at end of file
@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 
 # Create your models here.
 
@@ -20,6 +22,63 @@ class ChatMessage(models.Model):
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+    # Usage accounting, only filled in for assistant messages
+    model = models.CharField(max_length=100, null=True, blank=True)
+    prompt_tokens = models.PositiveIntegerField(null=True, blank=True)
+    completion_tokens = models.PositiveIntegerField(null=True, blank=True)
+    latency_ms = models.PositiveIntegerField(null=True, blank=True)
+    # Kept in sync by Postgres on every insert/update of `message`
+    search_vector = models.GeneratedField(
+        expression=SearchVector('message', config='english'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='chatmessage_search_gin'),
+        ]
 
     def __str__(self):
-        return self.message
\ No newline at end of file
+        return self.message
+
+
+class UsageRollup(models.Model):
+    """
+    Token usage aggregated per user and model over a fixed time bucket.
+    Rows are incremented as assistant messages are stored, so readers never
+    have to aggregate the message table.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    model = models.CharField(max_length=100)
+    bucket_start = models.DateTimeField()
+    message_count = models.PositiveIntegerField(default=0)
+    prompt_tokens = models.PositiveBigIntegerField(default=0)
+    completion_tokens = models.PositiveBigIntegerField(default=0)
+    latency_ms = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"{self.user_id} {self.model} @ {self.bucket_start}"
+
+
+class HourlyUsageRollup(UsageRollup):
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'model', 'bucket_start'], name='hourly_usage_rollup_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['model', 'bucket_start'], name='hourly_usage_model_bucket'),
+        ]
+
+
+class DailyUsageRollup(UsageRollup):
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'model', 'bucket_start'], name='daily_usage_rollup_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['model', 'bucket_start'], name='daily_usage_model_bucket'),
+        ]
@@ -109,6 +109,249 @@ class ErrorResponseSerializer(serializers.Serializer):
         help_text="When the error occurred"
     )
 
+class BatchChatRequestSerializer(serializers.Serializer):
+    """
+    Serializer for batch chat requests
+    """
+    prompts = serializers.ListField(
+        child=serializers.CharField(max_length=4000),
+        required=False,
+        min_length=1,
+        max_length=100,
+        help_text="Single-turn prompts, each answered independently"
+    )
+    conversations = serializers.ListField(
+        child=MessageSerializer(many=True),
+        required=False,
+        min_length=1,
+        max_length=100,
+        help_text="Conversations to complete, each a list of messages ending with a user message"
+    )
+    model = serializers.CharField(
+        max_length=100,
+        required=False,
+        default="gemma2:2b",
+        help_text="The AI model to use for every item in the batch"
+    )
+    stream = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Stream results as newline-delimited JSON in completion order"
+    )
+    use_cache = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Answer prompts from the semantic prompt cache when a similar prompt was seen before"
+    )
+
+    def validate(self, data):
+        """Validate that either prompts or conversations is provided, but not both"""
+        prompts = data.get('prompts')
+        conversations = data.get('conversations')
+
+        if not prompts and not conversations:
+            raise serializers.ValidationError("Either 'prompts' or 'conversations' must be provided")
+
+        if prompts and conversations:
+            raise serializers.ValidationError("Cannot provide both 'prompts' and 'conversations'")
+
+        if prompts:
+            if any(not prompt.strip() for prompt in prompts):
+                raise serializers.ValidationError("Prompts cannot be empty")
+            data['conversations'] = [
+                [{'role': 'user', 'content': prompt.strip()}] for prompt in prompts
+            ]
+
+        for messages in data['conversations']:
+            if not messages or messages[-1]['role'] != 'user':
+                raise serializers.ValidationError("Last message of every conversation must be from user")
+
+        return data
+
+
+class BatchChatResultSerializer(serializers.Serializer):
+    """
+    Serializer for a single batch item result
+    """
+    index = serializers.IntegerField(
+        help_text="Position of the item in the request"
+    )
+    success = serializers.BooleanField(
+        help_text="Whether this item was completed"
+    )
+    response = serializers.CharField(
+        required=False,
+        help_text="The AI assistant's response"
+    )
+    cached = serializers.BooleanField(
+        required=False,
+        help_text="Whether the response came from the semantic prompt cache"
+    )
+    error = serializers.CharField(
+        required=False,
+        help_text="Why this item failed"
+    )
+    conversation_id = serializers.IntegerField(
+        required=False,
+        help_text="The conversation the item was stored in"
+    )
+    assistant_message_id = serializers.IntegerField(
+        required=False,
+        help_text="The stored assistant message"
+    )
+
+
+class BatchChatResponseSerializer(serializers.Serializer):
+    """
+    Serializer for batch chat responses
+    """
+    results = BatchChatResultSerializer(
+        many=True,
+        help_text="One result per item, in request order"
+    )
+    model_used = serializers.CharField(
+        help_text="The model that was used to generate the responses"
+    )
+    timestamp = serializers.DateTimeField(
+        help_text="When the batch finished"
+    )
+    success = serializers.BooleanField(
+        help_text="Whether every item in the batch was completed"
+    )
+
+
+class ChatSearchResultSerializer(serializers.Serializer):
+    """
+    Serializer for a single full-text search hit
+    """
+    id = serializers.IntegerField(
+        help_text="The ID of the matching message"
+    )
+    conversation_id = serializers.IntegerField(
+        help_text="The conversation the message belongs to"
+    )
+    role = serializers.ChoiceField(
+        choices=['user', 'assistant'],
+        help_text="The role of the message sender"
+    )
+    content = serializers.CharField(
+        source='message',
+        help_text="The full content of the message"
+    )
+    snippet = serializers.CharField(
+        help_text="Excerpt of the message with matched terms wrapped in <mark> tags"
+    )
+    rank = serializers.FloatField(
+        help_text="Relevance score, higher is better"
+    )
+    timestamp = serializers.DateTimeField(
+        source='created_at',
+        help_text="When the message was created"
+    )
+
+
+class ChatSearchResponseSerializer(serializers.Serializer):
+    """
+    Serializer for paginated search responses
+    """
+    count = serializers.IntegerField(
+        help_text="Total number of matching messages"
+    )
+    next = serializers.URLField(
+        allow_null=True,
+        help_text="URL of the next page of results"
+    )
+    previous = serializers.URLField(
+        allow_null=True,
+        help_text="URL of the previous page of results"
+    )
+    results = ChatSearchResultSerializer(many=True)
+
+
+class ModelStatusSerializer(serializers.Serializer):
+    """
+    Serializer for the load state of a hot model
+    """
+    model = serializers.CharField(
+        help_text="The model name"
+    )
+    state = serializers.ChoiceField(
+        choices=['cold', 'loading', 'warm'],
+        help_text="Whether the model is believed to be loaded on the LLM server"
+    )
+    idle_seconds = serializers.IntegerField(
+        allow_null=True,
+        help_text="Seconds since the model last served a request or warm-up"
+    )
+    last_latency_ms = serializers.IntegerField(
+        allow_null=True,
+        help_text="Latency of the last request or warm-up"
+    )
+    recent_requests = serializers.IntegerField(
+        help_text="Requests served within the warm-up history window"
+    )
+    idle_ttl_seconds = serializers.IntegerField(
+        help_text="How long after its last request the model is kept warm, based on recent traffic"
+    )
+    warmups = serializers.IntegerField(
+        help_text="Successful warm-up requests sent"
+    )
+    warmup_failures = serializers.IntegerField(
+        help_text="Warm-up requests that failed"
+    )
+    cold_loads = serializers.IntegerField(
+        help_text="Warm-ups slow enough to have loaded the model"
+    )
+
+
+class ModelStatusResponseSerializer(serializers.Serializer):
+    """
+    Serializer for model status responses
+    """
+    models = ModelStatusSerializer(
+        many=True,
+        help_text="State of every configured hot model"
+    )
+    timestamp = serializers.DateTimeField(
+        help_text="When the state was read"
+    )
+
+
+class SemanticCacheStatsSerializer(serializers.Serializer):
+    """
+    Serializer for the semantic cache statistics of one model
+    """
+    model = serializers.CharField(
+        help_text="The model name"
+    )
+    entries = serializers.IntegerField(
+        help_text="Prompts currently cached for the model"
+    )
+    hits = serializers.IntegerField(
+        help_text="Lookups answered from the cache"
+    )
+    misses = serializers.IntegerField(
+        help_text="Lookups that went to the LLM"
+    )
+    hit_rate = serializers.FloatField(
+        help_text="Share of lookups answered from the cache"
+    )
+
+
+class SemanticCacheStatsResponseSerializer(serializers.Serializer):
+    """
+    Serializer for semantic cache statistics responses
+    """
+    enabled = serializers.BooleanField(
+        help_text="Whether the semantic cache is turned on"
+    )
+    models = SemanticCacheStatsSerializer(
+        many=True,
+        help_text="Statistics for every model that has been looked up"
+    )
+    timestamp = serializers.DateTimeField(
+        help_text="When the statistics were read"
+    )
 
 
 class ChatConversationSerializer(serializers.ModelSerializer):
@@ -0,0 +1,570 @@
+import json
+from datetime import datetime, timezone
+from unittest import mock, skipIf, skipUnless
+
+from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchQuery
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from aws_llm.models import ChatConversation, ChatMessage, DailyUsageRollup, HourlyUsageRollup
+from aws_llm.serializers import BatchChatRequestSerializer
+from aws_llm.utils import batch
+from aws_llm.utils.llm_wrapper import AWSLLMWrapper
+from aws_llm.utils.usage import usage_totals
+from aws_llm.utils.warmup import WarmupScheduler, start_warmup
+from aws_llm.views import ChatBatchView, ChatSearchView
+
+try:
+    import numpy as np
+    from aws_llm.utils.semantic_cache import SemanticCache
+except ImportError:
+    np = None
+
+
+def postgres_available():
+    if connection.vendor != 'postgresql':
+        return False
+    try:
+        connection.ensure_connection()
+    except OperationalError:
+        return False
+    finally:
+        connection.close()
+    return True
+
+
+POSTGRES_AVAILABLE = postgres_available()
+
+
+class ChatSearchViewTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        # No database needed: the search queryset is replaced by an empty result list
+        patcher = mock.patch('aws_llm.views.ChatMessage')
+        self.chat_message = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.chat_message.objects.filter.return_value.annotate.return_value.order_by.return_value = []
+
+    def search(self, user=None, **params):
+        request = self.factory.get('/api/aws-llm/chat/search/', params)
+        if user is not None:
+            force_authenticate(request, user=user)
+        return ChatSearchView.as_view()(request)
+
+    def test_query_is_a_websearch_over_the_users_messages(self):
+        self.search(q='"reset password" -email')
+        self.chat_message.objects.filter.assert_called_once_with(
+            conversation__user_id=1,
+            search_vector=SearchQuery('"reset password" -email', config='english', search_type='websearch'),
+        )
+
+    def test_authenticated_user_searches_their_own_messages(self):
+        self.search(user=User(id=7, username='alice'), q='password')
+        self.assertEqual(self.chat_message.objects.filter.call_args.kwargs['conversation__user_id'], 7)
+
+    def test_results_are_ranked_with_snippets(self):
+        self.search(q='password')
+        annotate = self.chat_message.objects.filter.return_value.annotate
+        self.assertEqual(set(annotate.call_args.kwargs), {'rank', 'snippet'})
+        annotate.return_value.order_by.assert_called_once_with('-rank', '-created_at', '-id')
+
+    def test_missing_query_is_rejected(self):
+        response = self.search()
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_page_is_not_found(self):
+        response = self.search(q='password', page='abc')
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_past_the_end_is_not_found(self):
+        response = self.search(q='password', page=5)
+        self.assertEqual(response.status_code, 404)
+
+    def test_empty_first_page(self):
+        response = self.search(q='password')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 0)
+
+
+@skipUnless(POSTGRES_AVAILABLE, "needs a reachable PostgreSQL server")
+class ChatSearchPostgresTests(TestCase):
+    # Only ask for a test database when there is a server to create it on
+    databases = {'default'} if POSTGRES_AVAILABLE else set()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='alice')
+        cls.other_user = User.objects.create(username='bob')
+        conversation = ChatConversation.objects.create(user=cls.user)
+        cls.strong_match = ChatMessage.objects.create(
+            conversation=conversation,
+            role='user',
+            message='How do I reset my password? The password reset email never arrives.',
+        )
+        cls.weak_match = ChatMessage.objects.create(
+            conversation=conversation,
+            role='assistant',
+            message='You can change your password from the account settings page.',
+        )
+        ChatMessage.objects.create(conversation=conversation, role='user', message='What are your opening hours?')
+        ChatMessage.objects.create(
+            conversation=ChatConversation.objects.create(user=cls.other_user),
+            role='user',
+            message='I forgot my password and my username',
+        )
+
+    def search(self, q, user=None):
+        request = APIRequestFactory().get('/api/aws-llm/chat/search/', {'q': q})
+        force_authenticate(request, user=user or self.user)
+        return ChatSearchView.as_view()(request)
+
+    def test_results_are_ranked_by_relevance(self):
+        results = self.search('passwords').data['results']
+        self.assertEqual([result['id'] for result in results], [self.strong_match.id, self.weak_match.id])
+
+    def test_snippet_marks_matched_terms(self):
+        result = self.search('reset').data['results'][0]
+        self.assertIn('<mark>reset</mark>', result['snippet'])
+        self.assertNotIn('<mark>', result['content'])
+
+    def test_other_users_messages_are_not_returned(self):
+        self.assertEqual(self.search('username').data['count'], 0)
+        self.assertEqual(self.search('username', user=self.other_user).data['count'], 1)
+
+    def test_search_vector_follows_message_updates(self):
+        ChatMessage.objects.filter(id=self.weak_match.id).update(message='Opening hours are nine to five.')
+        self.assertEqual(self.search('nine').data['count'], 1)
+        self.assertEqual(self.search('settings').data['count'], 0)
+
+    def test_search_vector_has_a_gin_index(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, ChatMessage._meta.db_table)
+        self.assertEqual(constraints['chatmessage_search_gin']['type'], 'gin')
+        self.assertEqual(constraints['chatmessage_search_gin']['columns'], ['search_vector'])
+
+
+class UsageTotalsTests(SimpleTestCase):
+    def message(self, model, created_at, prompt_tokens=10, completion_tokens=5, latency_ms=100):
+        return ChatMessage(
+            role='assistant',
+            model=model,
+            created_at=created_at,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms=latency_ms,
+        )
+
+    def test_messages_in_the_same_hour_collapse_into_one_increment(self):
+        totals = usage_totals([
+            self.message('m', datetime(2025, 1, 1, 10, 5, tzinfo=timezone.utc)),
+            self.message('m', datetime(2025, 1, 1, 10, 55, tzinfo=timezone.utc)),
+        ])
+        hour = datetime(2025, 1, 1, 10, tzinfo=timezone.utc)
+        day = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        self.assertEqual(set(totals), {(HourlyUsageRollup, 'm', hour), (DailyUsageRollup, 'm', day)})
+        self.assertEqual(totals[(HourlyUsageRollup, 'm', hour)], {
+            'message_count': 2, 'prompt_tokens': 20, 'completion_tokens': 10, 'latency_ms': 200,
+        })
+        self.assertEqual(totals[(DailyUsageRollup, 'm', day)], totals[(HourlyUsageRollup, 'm', hour)])
+
+    def test_hours_and_models_get_separate_rows(self):
+        totals = usage_totals([
+            self.message('a', datetime(2025, 1, 1, 10, 5, tzinfo=timezone.utc)),
+            self.message('a', datetime(2025, 1, 1, 11, 5, tzinfo=timezone.utc)),
+            self.message('b', datetime(2025, 1, 1, 11, 6, tzinfo=timezone.utc)),
+        ])
+        day = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        hourly = [key for key in totals if key[0] is HourlyUsageRollup]
+        self.assertEqual(len(hourly), 3)
+        self.assertEqual(totals[(DailyUsageRollup, 'a', day)]['message_count'], 2)
+        self.assertEqual(totals[(DailyUsageRollup, 'b', day)]['message_count'], 1)
+
+    def test_missing_usage_counts_as_zero(self):
+        totals = usage_totals([
+            self.message('m', datetime(2025, 1, 1, 10, tzinfo=timezone.utc), None, None, None),
+        ])
+        total = totals[(HourlyUsageRollup, 'm', datetime(2025, 1, 1, 10, tzinfo=timezone.utc))]
+        self.assertEqual(total, {'message_count': 1, 'prompt_tokens': 0, 'completion_tokens': 0, 'latency_ms': 0})
+
+
+class FakeResponse:
+    """Stand-in for a non-streaming requests.Response from the LLM server"""
+
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+    def json(self):
+        if not isinstance(self.body, dict):
+            raise json.JSONDecodeError("Expecting value", str(self.body), 0)
+        return self.body
+
+    def close(self):
+        pass
+
+
+def completion(content, prompt_tokens=3, completion_tokens=1):
+    return FakeResponse({
+        'choices': [{'message': {'content': content}}],
+        'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens},
+    })
+
+
+class FakeStreamResponse:
+    """Stand-in for a streamed requests.Response: one server-sent event per chunk"""
+    ok = True
+    status_code = 200
+
+    def __init__(self, chunks):
+        self.lines = [f"data: {json.dumps(chunk)}".encode() for chunk in chunks] + [b'data: [DONE]']
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+    def close(self):
+        pass
+
+
+class StreamingInvokeTests(SimpleTestCase):
+    def invoke(self, chunks):
+        client = AWSLLMWrapper(model='m', stream=True)
+        with mock.patch('aws_llm.utils.llm_wrapper.session.post', return_value=FakeStreamResponse(chunks)) as post, \
+                mock.patch('aws_llm.utils.llm_wrapper.time') as wrapper_time:
+            wrapper_time.monotonic.side_effect = [0, 1.5]
+            text = ''.join(client.invoke_with_history([{'role': 'user', 'content': 'hi'}]))
+        return client, text, post.call_args.kwargs['json']
+
+    def test_usage_comes_from_the_final_chunk(self):
+        client, text, payload = self.invoke([
+            {'choices': [{'delta': {'role': 'assistant'}}]},
+            {'choices': [{'delta': {'content': 'Hel'}}]},
+            {'choices': [{'delta': {'content': 'lo'}}]},
+            {'choices': [], 'usage': {'prompt_tokens': 3, 'completion_tokens': 2}},
+        ])
+        self.assertEqual(text, 'Hello')
+        self.assertEqual(payload['stream_options'], {'include_usage': True})
+        self.assertEqual(client.usage, {'prompt_tokens': 3, 'completion_tokens': 2})
+        self.assertEqual(client.latency_ms, 1500)
+
+    def test_stream_without_content_is_a_failure(self):
+        client, text, _ = self.invoke([{'choices': [], 'usage': {'prompt_tokens': 3, 'completion_tokens': 0}}])
+        self.assertEqual(text, '')
+        self.assertIsNone(client.latency_ms)
+
+
+class BatchChatRequestSerializerTests(SimpleTestCase):
+    def test_prompts_become_single_turn_conversations(self):
+        serializer = BatchChatRequestSerializer(data={'prompts': ['a', ' b ']})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data['conversations'], [
+            [{'role': 'user', 'content': 'a'}],
+            [{'role': 'user', 'content': 'b'}],
+        ])
+
+    def test_prompts_or_conversations_required(self):
+        serializer = BatchChatRequestSerializer(data={'model': 'm'})
+        self.assertFalse(serializer.is_valid())
+
+    def test_prompts_and_conversations_are_exclusive(self):
+        serializer = BatchChatRequestSerializer(data={
+            'prompts': ['a'],
+            'conversations': [[{'role': 'user', 'content': 'b'}]],
+        })
+        self.assertFalse(serializer.is_valid())
+
+    def test_conversation_must_end_with_user_message(self):
+        serializer = BatchChatRequestSerializer(data={'conversations': [[
+            {'role': 'user', 'content': 'hi'},
+            {'role': 'assistant', 'content': 'hello'},
+        ]]})
+        self.assertFalse(serializer.is_valid())
+
+    def test_blank_prompt_is_rejected(self):
+        serializer = BatchChatRequestSerializer(data={'prompts': ['ok', '   ']})
+        self.assertFalse(serializer.is_valid())
+
+
+class RunBatchTests(SimpleTestCase):
+    def test_invalid_upstream_body_is_a_failed_item(self):
+        responses = {'good': completion('fine'), 'bad': FakeResponse('<html>502</html>')}
+
+        def post(url, json=None, **kwargs):
+            return responses[json['messages'][-1]['content']]
+
+        with mock.patch('aws_llm.utils.llm_wrapper.session.post', side_effect=post):
+            items = {index: (result, error) for index, result, error in batch.run_batch('m', [
+                [{'role': 'user', 'content': 'good'}],
+                [{'role': 'user', 'content': 'bad'}],
+            ])}
+
+        self.assertEqual(items[0][0]['response'], 'fine')
+        self.assertIsNone(items[1][0])
+        self.assertIsNotNone(items[1][1])
+
+
+@skipIf(np is None, "numpy is not installed")
+@override_settings(SEMANTIC_CACHE_ENABLED=True)
+class RunBatchCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = SemanticCache(threshold=0.95, max_entries=10, max_messages=1, max_chars=2000)
+        patcher = mock.patch('aws_llm.utils.semantic_cache.semantic_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.conversations = [[{'role': 'user', 'content': 'How do I reset my password?'}]]
+
+    def run_batch(self, response, **kwargs):
+        with mock.patch('aws_llm.utils.llm_wrapper.session.post', return_value=response) as post:
+            items = list(batch.run_batch('m', self.conversations, **kwargs))
+        return items, post
+
+    def test_cache_is_off_unless_requested(self):
+        self.cache.store('m', self.conversations[0], 'cached answer')
+        items, post = self.run_batch(completion('fresh answer'))
+
+        self.assertEqual(items[0][1]['response'], 'fresh answer')
+        self.assertNotIn('cached', items[0][1])
+        post.assert_called_once()
+
+    def test_hit_is_marked_cached(self):
+        self.cache.store('m', self.conversations[0], 'cached answer')
+        items, post = self.run_batch(completion('fresh answer'), use_cache=True)
+
+        self.assertEqual(items[0][1]['response'], 'cached answer')
+        self.assertTrue(items[0][1]['cached'])
+        post.assert_not_called()
+
+    def test_completions_are_stored(self):
+        self.run_batch(completion('fresh answer'), use_cache=True)
+        self.assertEqual(self.cache.lookup('m', self.conversations[0]), 'fresh answer')
+
+    def test_invalid_completions_are_not_stored(self):
+        self.run_batch(FakeResponse('<html>502</html>'), use_cache=True)
+        self.run_batch(FakeResponse({'error': 'overloaded'}, status_code=503), use_cache=True)
+        self.assertNotIn('m', self.cache.indexes)
+
+
+class SaveBatchTests(SimpleTestCase):
+    def test_cached_results_stay_out_of_usage_rollups(self):
+        conversations = [[{'role': 'user', 'content': 'a'}], [{'role': 'user', 'content': 'b'}]]
+        results = {
+            0: {'response': 'x', 'usage': {'prompt_tokens': 3}, 'latency_ms': 10},
+            1: {'response': 'y', 'usage': {}, 'latency_ms': 0, 'cached': True},
+        }
+        with mock.patch('aws_llm.utils.batch.transaction'), \
+                mock.patch.object(ChatConversation.objects, 'bulk_create', side_effect=lambda objs: objs), \
+                mock.patch.object(ChatMessage.objects, 'bulk_create', side_effect=lambda objs: objs), \
+                mock.patch('aws_llm.utils.batch.record_usage') as record_usage:
+            batch.save_batch(1, 'm', conversations, results)
+
+        messages = record_usage.call_args.args[1]
+        self.assertEqual([message.message for message in messages], ['x'])
+
+
+@skipIf(np is None, "numpy is not installed")
+class SemanticCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = SemanticCache(threshold=0.95, max_entries=3, max_messages=1, max_chars=50)
+
+    def prompt(self, content):
+        return [{'role': 'user', 'content': content}]
+
+    def test_similar_prompt_is_a_hit(self):
+        self.cache.store('m', self.prompt('How do I reset my password?'), 'answer')
+        self.assertEqual(self.cache.lookup('m', self.prompt('how do I reset my password')), 'answer')
+
+    def test_unrelated_prompt_is_a_miss(self):
+        self.cache.store('m', self.prompt('How do I reset my password?'), 'answer')
+        self.assertIsNone(self.cache.lookup('m', self.prompt('What are your opening hours?')))
+
+    def test_small_typo_is_a_hit(self):
+        self.cache.threshold = 0.85
+        self.cache.store('m', self.prompt('How do I reset my password?'), 'answer')
+        self.assertEqual(self.cache.lookup('m', self.prompt('How do I reset my pasword?')), 'answer')
+
+    def test_prompts_differing_in_payload_are_misses(self):
+        # Each pair is close in n-gram space; a lower threshold makes sure
+        # the lexical check is what rejects them
+        self.cache.threshold = 0.85
+        self.cache.max_chars = 2000
+        pairs = [
+            ('Is the product in stock in size 42?', 'Is the product in stock in size 44?'),
+            ('How do I cancel my order number 12345?', 'How do I cancel my order number 12346?'),
+            ('Summarize: the quick brown fox jumps over the lazy dog',
+             'Summarize: the quick brown fox jumps over the lazy cat'),
+            ('Classify as positive or negative: "I love this product, it works great"',
+             'Classify as positive or negative: "I hate this product, it never works"'),
+        ]
+        for cached, query in pairs:
+            with self.subTest(query=query):
+                self.cache.store('m', self.prompt(cached), cached)
+                self.assertIsNone(self.cache.lookup('m', self.prompt(query)))
+
+    def test_threshold_decides_hits(self):
+        self.cache.store('m', self.prompt('How do I reset my password?'), 'answer')
+        self.cache.threshold = 1.01
+        self.assertIsNone(self.cache.lookup('m', self.prompt('How do I reset my password?')))
+
+    def test_models_are_cached_separately(self):
+        self.cache.store('m', self.prompt('How do I reset my password?'), 'answer')
+        self.assertIsNone(self.cache.lookup('other', self.prompt('How do I reset my password?')))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        prompts = ['reset my password', 'opening hours', 'cancel my order']
+        for prompt in prompts:
+            self.cache.store('m', self.prompt(prompt), prompt)
+        # Touch the oldest entry so the second one becomes least recently used
+        self.cache.lookup('m', self.prompt('reset my password'))
+        self.cache.store('m', self.prompt('shipping costs'), 'shipping costs')
+
+        self.assertEqual(self.cache.indexes['m'].size, 3)
+        self.assertIsNone(self.cache.lookup('m', self.prompt('opening hours')))
+        self.assertEqual(self.cache.lookup('m', self.prompt('reset my password')), 'reset my password')
+        self.assertEqual(self.cache.lookup('m', self.prompt('shipping costs')), 'shipping costs')
+
+    def test_long_or_multi_turn_conversations_are_not_cached(self):
+        self.cache.store('m', self.prompt('x' * 51), 'answer')
+        self.cache.store('m', self.prompt('hi') + [{'role': 'assistant', 'content': 'hello'}], 'answer')
+        self.assertNotIn('m', self.cache.indexes)
+
+    def test_hit_rate_is_reported_per_model(self):
+        self.cache.store('m', self.prompt('How do I reset my password?'), 'answer')
+        self.cache.lookup('m', self.prompt('How do I reset my password?'))
+        self.cache.lookup('m', self.prompt('What are your opening hours?'))
+
+        self.assertEqual(self.cache.snapshot(), [
+            {'model': 'm', 'entries': 1, 'hits': 1, 'misses': 1, 'hit_rate': 0.5},
+        ])
+
+
+class ChatBatchViewTests(SimpleTestCase):
+    def test_invalid_list_item_is_a_bad_request(self):
+        request = APIRequestFactory().post(
+            '/api/aws-llm/chat/batch/', {'prompts': ['ok', 'x' * 5000]}, format='json'
+        )
+        response = ChatBatchView.as_view()(request)
+        response.render()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('1', json.loads(response.content)['details']['prompts'])
+
+
+class ChatBatchStreamTests(SimpleTestCase):
+    def test_completed_items_are_saved_when_client_disconnects(self):
+        def run_batch(model, conversations, use_cache=False):
+            yield 0, {'response': 'a', 'usage': {}, 'latency_ms': 5}, None
+            yield 1, {'response': 'b', 'usage': {}, 'latency_ms': 5}, None
+
+        conversations = [[{'role': 'user', 'content': 'x'}]] * 2
+        with mock.patch('aws_llm.views.run_batch', side_effect=run_batch), \
+                mock.patch('aws_llm.views.save_batch') as save_batch:
+            stream = ChatBatchView()._stream_batch(1, 'm', conversations, False)
+            next(stream)
+            stream.close()
+
+        save_batch.assert_called_once()
+        self.assertEqual(list(save_batch.call_args.args[3]), [0])
+
+
+class WarmupSchedulerTests(SimpleTestCase):
+    def setUp(self):
+        self.scheduler = WarmupScheduler(['m'], keep_alive=300, idle_ttl=3600, cold_load_ms=2000, tick=15)
+        self.state = self.scheduler.models['m']
+
+    def warm(self, response):
+        with mock.patch('aws_llm.utils.llm_wrapper.session.post', return_value=response):
+            self.scheduler.warm('m')
+
+    def test_successful_warm_up(self):
+        self.warm(completion('hi'))
+        self.assertEqual(self.state.state, 'warm')
+        self.assertEqual(self.state.warmups, 1)
+
+    def test_non_json_body_is_a_failed_warm_up(self):
+        self.warm(FakeResponse('<html>Bad Gateway</html>'))
+        self.assertEqual(self.state.state, 'cold')
+        self.assertEqual(self.state.warmups, 0)
+        self.assertEqual(self.state.warmup_failures, 1)
+
+    def test_error_status_is_a_failed_warm_up(self):
+        self.warm(FakeResponse({'error': 'bad gateway'}, status_code=502))
+        self.assertEqual(self.state.state, 'cold')
+        self.assertEqual(self.state.warmup_failures, 1)
+
+    def test_slow_warm_up_counts_as_cold_load(self):
+        with mock.patch('aws_llm.utils.llm_wrapper.time') as wrapper_time:
+            wrapper_time.monotonic.side_effect = [0, 5]
+            self.warm(completion('hi'))
+        self.assertEqual(self.state.last_latency_ms, 5000)
+        self.assertEqual(self.state.cold_loads, 1)
+
+    def test_long_real_request_is_not_a_cold_load(self):
+        self.scheduler.record_request('m', 9000)
+        self.assertEqual(self.state.state, 'warm')
+        self.assertEqual(self.state.cold_loads, 0)
+
+    @override_settings(LLM_WARMUP_ENABLED=False)
+    def test_start_warmup_respects_setting(self):
+        with mock.patch('aws_llm.utils.warmup.scheduler') as scheduler:
+            start_warmup()
+        scheduler.start.assert_not_called()
+
+    @override_settings(LLM_WARMUP_ENABLED=True)
+    def test_start_warmup_when_enabled(self):
+        with mock.patch('aws_llm.utils.warmup.scheduler') as scheduler:
+            start_warmup()
+        scheduler.start.assert_called_once()
+
+    def test_not_due_before_keep_alive_margin(self):
+        self.scheduler.started_at = 0
+        self.state.last_touch = 100
+        self.assertFalse(self.scheduler._is_due('m', 100 + 269))
+        self.assertTrue(self.scheduler._is_due('m', 100 + 270))
+
+    def test_traffic_resets_the_timer(self):
+        self.scheduler.started_at = 0
+        self.state.last_request = 250
+        self.state.last_touch = 250
+        self.assertFalse(self.scheduler._is_due('m', 400))
+
+    def test_idle_model_is_left_to_unload(self):
+        self.scheduler.started_at = 0
+        self.state.last_touch = 3300
+        self.assertTrue(self.scheduler._is_due('m', 3590))
+        self.assertFalse(self.scheduler._is_due('m', 3601))
+
+    def is_due_after_traffic(self, requests, now):
+        self.scheduler.started_at = 0
+        self.state.requests.extend(requests)
+        self.state.last_request = requests[-1]
+        self.state.last_touch = now - 300
+        return self.scheduler._is_due('m', now)
+
+    def test_busy_model_is_kept_warm_past_the_idle_ttl(self):
+        # One request every 50 s: idle for longer than LLM_WARMUP_IDLE_TTL_SECONDS but still pinged
+        self.assertTrue(self.is_due_after_traffic(list(range(1000, 3001, 50)), now=3000 + 5000))
+
+    def test_quiet_model_is_dropped_before_the_idle_ttl(self):
+        # Three requests in two hours: not worth a ping after 20 idle minutes
+        self.assertFalse(self.is_due_after_traffic([1000, 3000, 6000], now=6000 + 1200))
+
+    def test_same_idle_time_with_more_traffic_is_due(self):
+        self.assertTrue(self.is_due_after_traffic(list(range(1000, 6001, 100)), now=6000 + 1200))
+
+    def test_young_worker_history_is_not_read_as_low_rate(self):
+        self.scheduler.started_at = 0
+        self.state.requests.extend([100, 200, 300])
+        self.assertEqual(self.scheduler._idle_ttl(self.state, 300), 7200)
+        self.assertEqual(self.scheduler._idle_ttl(self.state, 7200), 450)
+
+    def test_expire_marks_model_cold_and_drops_old_requests(self):
+        self.state.state = 'warm'
+        self.state.last_touch = 0
+        self.state.requests.extend([0, 4000])
+        self.scheduler._expire(self.state, 7300)
+        self.assertEqual(self.state.state, 'cold')
+        self.assertEqual(list(self.state.requests), [4000])
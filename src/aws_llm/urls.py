@@ -6,4 +6,8 @@ app_name = 'aws_llm'
 urlpatterns = [
     path('chat/', views.ChatResponseView.as_view(), name='chat_response'),
     path('chat/history/', views.ChatHistoryView.as_view(), name='chat_history'),
+    path('chat/batch/', views.ChatBatchView.as_view(), name='chat_batch'),
+    path('chat/search/', views.ChatSearchView.as_view(), name='chat_search'),
+    path('cache/stats/', views.SemanticCacheStatsView.as_view(), name='semantic_cache_stats'),
+    path('models/status/', views.ModelStatusView.as_view(), name='model_status'),
 ]
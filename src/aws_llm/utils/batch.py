@@ -0,0 +1,130 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.db import transaction
+
+from aws_llm.models import ChatConversation, ChatMessage
+from aws_llm.utils.llm_wrapper import AWSLLMWrapper
+from aws_llm.utils.usage import record_usage
+from aws_llm.utils.warmup import scheduler
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Process-wide pool, so concurrent batches share one upstream concurrency limit"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BATCH_CHAT_MAX_WORKERS,
+                thread_name_prefix='batch-chat',
+            )
+    return _executor
+
+
+def complete(model: str, messages: list):
+    """Run a single non-streaming completion and return its text and usage"""
+    client = AWSLLMWrapper(model=model)
+    response_text = next(client.invoke_with_history(messages), None)
+    # The wrapper yields an error string instead of raising when the body
+    # can't be parsed; latency is only recorded for real completions
+    if response_text is None or client.latency_ms is None:
+        raise Exception("No valid response from upstream LLM")
+    scheduler.record_request(model, client.latency_ms)
+    return {
+        'response': response_text,
+        'usage': client.usage or {},
+        'latency_ms': client.latency_ms,
+    }
+
+
+def run_batch(model: str, conversations: list, use_cache: bool = False):
+    """
+    Generator that yields (index, result, error) for each conversation as soon
+    as its completion finishes. With use_cache, items answered by the semantic
+    cache come first and their result is marked as cached.
+    """
+    cache = None
+    cached_responses = [None] * len(conversations)
+    if use_cache and settings.SEMANTIC_CACHE_ENABLED:
+        # Imported here so numpy is only loaded when the cache is turned on
+        from aws_llm.utils.semantic_cache import semantic_cache
+        cache = semantic_cache
+        # One vectorized search for the whole batch instead of one per item
+        cached_responses = cache.lookup_many(model, conversations)
+
+    for index, response_text in enumerate(cached_responses):
+        if response_text is not None:
+            yield index, {'response': response_text, 'usage': {}, 'latency_ms': 0, 'cached': True}, None
+
+    executor = get_executor()
+    futures = {
+        executor.submit(complete, model, messages): index
+        for index, messages in enumerate(conversations)
+        if cached_responses[index] is None
+    }
+    try:
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                yield index, None, str(e)
+                continue
+            # complete() raises on error bodies, so only real completions get here
+            if cache is not None:
+                cache.store(model, conversations[index], result['response'])
+            yield index, result, None
+    finally:
+        # Closed early (e.g. the client went away): drop items not started yet
+        for future in futures:
+            future.cancel()
+
+
+def save_batch(user_id: int, model: str, conversations: list, results: dict):
+    """
+    Store every successful batch item as its own conversation using bulk inserts.
+    Returns {index: (conversation, assistant_message)}.
+    """
+    indexes = sorted(results)
+    if not indexes:
+        return {}
+
+    with transaction.atomic():
+        created_conversations = ChatConversation.objects.bulk_create(
+            [ChatConversation(user_id=user_id) for _ in indexes]
+        )
+
+        chat_messages = []
+        assistant_messages = {}
+        for index, conversation in zip(indexes, created_conversations):
+            for msg in conversations[index]:
+                chat_messages.append(ChatMessage(
+                    conversation=conversation,
+                    message=msg['content'],
+                    role=msg['role']
+                ))
+            result = results[index]
+            assistant_message = ChatMessage(
+                conversation=conversation,
+                message=result['response'],
+                role='assistant',
+                model=model,
+                prompt_tokens=result['usage'].get('prompt_tokens'),
+                completion_tokens=result['usage'].get('completion_tokens'),
+                latency_ms=result['latency_ms']
+            )
+            chat_messages.append(assistant_message)
+            assistant_messages[index] = (conversation, assistant_message)
+
+        ChatMessage.objects.bulk_create(chat_messages)
+        # Cache hits cost no upstream tokens, so they stay out of the rollups
+        record_usage(user_id, [
+            message for index, (_, message) in assistant_messages.items()
+            if not results[index].get('cached')
+        ])
+
+    return assistant_messages
@@ -1,17 +1,30 @@
 import json
+import time
 import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+# Shared across wrappers (and batch worker threads) so upstream connections
+# are reused instead of re-established for every completion
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
 
 class AWSLLMWrapper:
-    def __init__(self, model: str, stream: bool = False):
+    def __init__(self, model: str, stream: bool = False, max_tokens: int = None, use_cache: bool = False):
         self.model = model
         self.stream = stream
+        self.max_tokens = max_tokens
+        self.use_cache = use_cache
         self.messages = []
+        self.usage = None
+        self.latency_ms = None
+        self.cache_hit = False
 
     def invoke(self, prompt: str):
         """Generator that yields each chunk as it arrives"""
         self.messages.append({"role": "user", "content": prompt})
         try:
-            response = requests.post("http://ec2-13-49-225-30.eu-north-1.compute.amazonaws.com:8080/v1/chat/completions", 
+            response = session.post("http://ec2-13-49-225-30.eu-north-1.compute.amazonaws.com:8080/v1/chat/completions", 
                                 json={"model": self.model, "messages": self.messages, "stream": self.stream }, 
                                 headers={"Content-Type": "application/json", "Authorization": "Bearer demo"},
                                 stream=True)
@@ -46,15 +59,50 @@ class AWSLLMWrapper:
         self.messages.append({"role": "assistant", "content": full_response})
 
     def invoke_with_history(self, messages: list):
-        """Generator that yields each chunk as it arrives, using conversation history"""
+        """Generator that yields each chunk as it arrives, using conversation history
+
+        Token usage and generation latency of the call are left on
+        `self.usage` and `self.latency_ms` once the response is read.
+        With `use_cache`, near-duplicate short prompts are answered from the
+        semantic cache and `self.cache_hit` is set.
+        """
+        self.usage = None
+        self.latency_ms = None
+        self.cache_hit = False
+
+        cache = None
+        if self.use_cache and settings.SEMANTIC_CACHE_ENABLED:
+            # Imported here so numpy is only loaded when the cache is turned on
+            from aws_llm.utils.semantic_cache import semantic_cache
+            cache = semantic_cache
+            cached_response = cache.lookup(self.model, messages)
+            if cached_response is not None:
+                self.cache_hit = True
+                self.latency_ms = 0
+                yield cached_response
+                return
+
+        payload = {"model": self.model, "messages": messages, "stream": self.stream}
+        if self.max_tokens is not None:
+            payload["max_tokens"] = self.max_tokens
+        if self.stream:
+            # Ask the server to append a final chunk carrying the usage block
+            payload["stream_options"] = {"include_usage": True}
+        started = time.monotonic()
         try:
-            response = requests.post("http://ec2-13-49-225-30.eu-north-1.compute.amazonaws.com:8080/v1/chat/completions", 
-                                json={"model": self.model, "messages": messages, "stream": self.stream }, 
+            response = session.post("http://ec2-13-49-225-30.eu-north-1.compute.amazonaws.com:8080/v1/chat/completions", 
+                                json=payload, 
                                 headers={"Content-Type": "application/json", "Authorization": "Bearer demo"},
                                 stream=True)
         except Exception as e:
             print(f"Error invoking AWS LLM: {e}")
             return
+
+        if not response.ok:
+            # e.g. a 502 from a proxy in front of the model server
+            print(f"Error invoking AWS LLM: HTTP {response.status_code}")
+            response.close()
+            return
             
         full_response = ""
 
@@ -69,15 +117,30 @@ class AWSLLMWrapper:
                         
                         try:
                             chunk = json.loads(data)
-                            if "delta" in chunk["choices"][-1] and "content" in chunk["choices"][-1]["delta"]:
+                            if chunk.get("usage"):
+                                self.usage = chunk["usage"]
+                            # The usage chunk comes with an empty choices list
+                            if chunk.get("choices") and "delta" in chunk["choices"][-1] and "content" in chunk["choices"][-1]["delta"]:
                                 content = chunk["choices"][-1]["delta"]["content"]
                                 full_response += content
                                 yield content
                         except json.JSONDecodeError:
                             continue
+            if not full_response:
+                # A stream without content is as useless as an error status
+                print("Error invoking AWS LLM: empty stream")
+                return
+            self.latency_ms = int((time.monotonic() - started) * 1000)
+            if cache is not None:
+                cache.store(self.model, messages, full_response)
         else:
             try:
-                response_content = response.json()["choices"][-1]["message"]["content"]
+                response_json = response.json()
+                self.usage = response_json.get("usage")
+                self.latency_ms = int((time.monotonic() - started) * 1000)
+                response_content = response_json["choices"][-1]["message"]["content"]
+                if cache is not None:
+                    cache.store(self.model, messages, response_content)
                 yield response_content
             except json.JSONDecodeError as e:
                 yield "Error: Invalid JSON response"
@@ -0,0 +1,195 @@
+import re
+import threading
+import zlib
+from difflib import SequenceMatcher
+
+import numpy as np
+from django.conf import settings
+
+VECTOR_DIM = 2048
+# Words only one of two prompts has must be at least this close in spelling to
+# a word the other prompt has, so typos match but "dog" never matches "cat"
+WORD_SIMILARITY = 0.8
+
+
+def tokenize(text: str) -> list:
+    return re.findall(r"\w+", text.lower())
+
+
+def same_payload(query: list, cached: list) -> bool:
+    """
+    Lexical check behind the cosine threshold. Templated prompts that only
+    differ in their payload (a number, a name, a swapped word) embed very
+    close together, so a hit also needs the same numbers and no word that
+    the other prompt lacks beyond a small spelling difference.
+    """
+    query_words, cached_words = set(query), set(cached)
+    if {w for w in query_words if w.isdigit()} != {w for w in cached_words if w.isdigit()}:
+        return False
+    for ours, theirs in ((query_words - cached_words, cached_words), (cached_words - query_words, query_words)):
+        for word in ours:
+            if not any(SequenceMatcher(None, word, other).ratio() >= WORD_SIMILARITY for other in theirs):
+                return False
+    return True
+
+
+class HashingFeaturizer:
+    """
+    Embeds text as L2-normalised counts of hashed word and character n-grams.
+    Runs on the CPU with no model to load; close paraphrases share most of
+    their n-grams and end up with a high cosine similarity.
+    """
+
+    def __init__(self, dim: int = VECTOR_DIM, char_ngrams=(3, 4, 5)):
+        self.dim = dim
+        self.char_ngrams = char_ngrams
+
+    def _features(self, text: str):
+        words = tokenize(text)
+        yield from words
+        for first, second in zip(words, words[1:]):
+            yield f"{first} {second}"
+        padded = f" {' '.join(words)} "
+        for n in self.char_ngrams:
+            for start in range(len(padded) - n + 1):
+                yield padded[start:start + n]
+
+    def embed(self, texts: list) -> np.ndarray:
+        """Return one unit-length row per text"""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.fromiter(
+                (zlib.crc32(feature.encode('utf-8')) for feature in self._features(text)),
+                dtype=np.uint32,
+            )
+            # Low bits pick the bucket, the top bit the sign, so collisions cancel out on average
+            signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+            np.add.at(matrix[row], hashes % self.dim, signs)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+class SemanticCacheIndex:
+    """Fixed-capacity matrix of prompt vectors for one model, evicted LRU"""
+
+    def __init__(self, dim: int, capacity: int):
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.last_used = np.zeros(capacity, dtype=np.int64)
+        self.responses = [None] * capacity
+        self.words = [None] * capacity
+        self.size = 0
+
+    def search(self, queries: np.ndarray):
+        """Return the best matching slot and its cosine similarity for every query row"""
+        if self.size == 0:
+            return np.full(len(queries), -1), np.zeros(len(queries), dtype=np.float32)
+        scores = queries @ self.vectors[:self.size].T
+        best = scores.argmax(axis=1)
+        return best, scores[np.arange(len(queries)), best]
+
+    def add(self, vector: np.ndarray, words: list, response: str, tick: int):
+        if self.size < len(self.vectors):
+            slot = self.size
+            self.size += 1
+        else:
+            slot = int(self.last_used.argmin())
+        self.vectors[slot] = vector
+        self.words[slot] = words
+        self.responses[slot] = response
+        self.last_used[slot] = tick
+
+
+class SemanticCache:
+    """
+    Near-duplicate prompt cache in front of the LLM, one index per model.
+    Only conversations of at most `max_messages` messages are cached, since
+    longer histories almost never repeat.
+    """
+
+    def __init__(self, threshold, max_entries, max_messages, max_chars):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_messages = max_messages
+        self.max_chars = max_chars
+        self.featurizer = HashingFeaturizer()
+        self.indexes = {}
+        self.stats = {}
+        self._tick = 0
+        self._lock = threading.Lock()
+
+    def _key(self, messages: list):
+        """Text the conversation is matched on, or None if it shouldn't be cached"""
+        if not messages or len(messages) > self.max_messages:
+            return None
+        if len(messages) == 1:
+            key = messages[0]['content']
+        else:
+            key = "\n".join(f"{msg['role']}: {msg['content']}" for msg in messages)
+        return key if len(key) <= self.max_chars else None
+
+    def lookup_many(self, model: str, conversations: list) -> list:
+        """Return the cached response (or None) for each conversation, in one vectorized search"""
+        results = [None] * len(conversations)
+        keys = [(position, self._key(messages)) for position, messages in enumerate(conversations)]
+        keys = [(position, key) for position, key in keys if key is not None]
+        if not keys:
+            return results
+
+        queries = self.featurizer.embed([key for _, key in keys])
+        with self._lock:
+            stats = self.stats.setdefault(model, {'hits': 0, 'misses': 0})
+            index = self.indexes.get(model)
+            if index is None:
+                stats['misses'] += len(keys)
+                return results
+
+            best, scores = index.search(queries)
+            for (position, key), slot, score in zip(keys, best, scores):
+                if slot >= 0 and score >= self.threshold and same_payload(tokenize(key), index.words[slot]):
+                    self._tick += 1
+                    index.last_used[slot] = self._tick
+                    results[position] = index.responses[slot]
+                    stats['hits'] += 1
+                else:
+                    stats['misses'] += 1
+        return results
+
+    def lookup(self, model: str, messages: list):
+        return self.lookup_many(model, [messages])[0]
+
+    def store(self, model: str, messages: list, response: str):
+        key = self._key(messages)
+        if key is None or not response:
+            return
+        vector = self.featurizer.embed([key])[0]
+        with self._lock:
+            index = self.indexes.get(model)
+            if index is None:
+                index = self.indexes[model] = SemanticCacheIndex(self.featurizer.dim, self.max_entries)
+            self._tick += 1
+            index.add(vector, tokenize(key), response, self._tick)
+
+    def snapshot(self):
+        """Per-model entry counts and hit rates, for the stats endpoint"""
+        with self._lock:
+            models = []
+            for model, stats in self.stats.items():
+                lookups = stats['hits'] + stats['misses']
+                index = self.indexes.get(model)
+                models.append({
+                    'model': model,
+                    'entries': index.size if index is not None else 0,
+                    'hits': stats['hits'],
+                    'misses': stats['misses'],
+                    'hit_rate': stats['hits'] / lookups if lookups else 0.0,
+                })
+            return models
+
+
+semantic_cache = SemanticCache(
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+    max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+    max_messages=settings.SEMANTIC_CACHE_MAX_MESSAGES,
+    max_chars=settings.SEMANTIC_CACHE_MAX_CHARS,
+)
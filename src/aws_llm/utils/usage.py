@@ -0,0 +1,45 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+
+from aws_llm.models import DailyUsageRollup, HourlyUsageRollup
+
+
+def usage_totals(messages: list) -> dict:
+    """Collapse assistant messages into one increment per (rollup model, model, bucket start)"""
+    totals = defaultdict(lambda: {'message_count': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'latency_ms': 0})
+
+    for message in messages:
+        hour = message.created_at.replace(minute=0, second=0, microsecond=0)
+        day = hour.replace(hour=0)
+        for rollup_model, bucket_start in ((HourlyUsageRollup, hour), (DailyUsageRollup, day)):
+            total = totals[(rollup_model, message.model, bucket_start)]
+            total['message_count'] += 1
+            total['prompt_tokens'] += message.prompt_tokens or 0
+            total['completion_tokens'] += message.completion_tokens or 0
+            total['latency_ms'] += message.latency_ms or 0
+
+    return totals
+
+
+def record_usage(user_id: int, messages: list):
+    """Add the token usage of assistant messages to the hourly and daily rollups"""
+    with transaction.atomic():
+        for (rollup_model, model, bucket_start), total in usage_totals(messages).items():
+            rollup_model.objects.get_or_create(
+                user_id=user_id,
+                model=model,
+                bucket_start=bucket_start,
+            )
+            # Increment in SQL so concurrent workers don't overwrite each other
+            rollup_model.objects.filter(
+                user_id=user_id,
+                model=model,
+                bucket_start=bucket_start,
+            ).update(
+                message_count=F('message_count') + total['message_count'],
+                prompt_tokens=F('prompt_tokens') + total['prompt_tokens'],
+                completion_tokens=F('completion_tokens') + total['completion_tokens'],
+                latency_ms=F('latency_ms') + total['latency_ms'],
+            )
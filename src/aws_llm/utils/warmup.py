@@ -0,0 +1,188 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+from aws_llm.utils.llm_wrapper import AWSLLMWrapper
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MESSAGES = [{"role": "user", "content": "hi"}]
+# The busiest models are kept warm for up to this multiple of the idle TTL
+MAX_IDLE_TTL_FACTOR = 2
+
+
+class ModelState:
+    """Load state of one hot model as seen from this worker"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.state = 'cold'
+        self.last_touch = None
+        self.last_request = None
+        self.last_latency_ms = None
+        self.requests = deque()
+        self.warmups = 0
+        self.warmup_failures = 0
+        self.cold_loads = 0
+
+
+class WarmupScheduler:
+    """
+    Keeps the configured hot models loaded on the upstream server.
+
+    The server unloads a model after `keep_alive` seconds without a call, so
+    a model is pinged once it has been idle for most of that window. Real
+    traffic resets the timer, so busy models are never pinged. How long a
+    model is kept warm after its last request follows its recent request
+    rate, see `_idle_ttl`; after that it is left to unload.
+    """
+
+    def __init__(self, models, keep_alive, idle_ttl, cold_load_ms, tick=15):
+        self.keep_alive = keep_alive
+        self.idle_ttl = idle_ttl
+        # Requests are remembered for as long as the longest idle TTL
+        self.history = idle_ttl * MAX_IDLE_TTL_FACTOR
+        self.cold_load_ms = cold_load_ms
+        self.tick = tick
+        self.models = {model: ModelState(model) for model in models}
+        self.started_at = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Warm every hot model now and keep them warm from a background thread"""
+        if self._thread is not None:
+            return
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='llm-warmup', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        for model in self.models:
+            self.warm(model)
+        while not self._stop.wait(self.tick):
+            self.run_pending()
+
+    def run_pending(self):
+        """Ping every model whose keep-alive window is about to run out"""
+        for model in self.models:
+            if self._is_due(model, time.monotonic()):
+                self.warm(model)
+
+    def _is_due(self, model, now):
+        with self._lock:
+            state = self.models[model]
+            self._expire(state, now)
+            # Traffic since startup (or the startup warm-up itself) keeps a model hot
+            last_active = state.last_request or self.started_at
+            if last_active is None or now - last_active > self._idle_ttl(state, now):
+                return False
+            # Leave a margin of two ticks so the ping lands before the unload
+            return state.last_touch is None or now - state.last_touch >= self.keep_alive - 2 * self.tick
+
+    def _idle_ttl(self, state, now):
+        """
+        Seconds after its last request that a model is kept warm. A model
+        averaging one request per keep-alive window gets `idle_ttl`, busier
+        models up to `history`, and rarely used ones proportionally less,
+        since pinging them costs more calls than the cold loads it saves.
+        """
+        if not state.requests:
+            # Nothing seen yet (e.g. right after startup)
+            return self.idle_ttl
+        window = self.history
+        if self.started_at is not None:
+            # Don't read a young worker's short history as a low rate
+            window = min(window, max(now - self.started_at, self.keep_alive))
+        requests_per_keep_alive = len(state.requests) * self.keep_alive / window
+        return min(self.idle_ttl * requests_per_keep_alive, self.history)
+
+    def _expire(self, state, now):
+        if state.last_touch is not None and now - state.last_touch > self.keep_alive:
+            state.state = 'cold'
+        while state.requests and now - state.requests[0] > self.history:
+            state.requests.popleft()
+
+    def warm(self, model):
+        """Send a one-token completion so the server loads the model"""
+        with self._lock:
+            self.models[model].state = 'loading'
+
+        client = AWSLLMWrapper(model=model, max_tokens=1)
+        try:
+            response = next(client.invoke_with_history(WARMUP_MESSAGES), None)
+        except Exception as e:
+            logger.error(f"Error warming up model {model}: {str(e)}")
+            response = None
+
+        with self._lock:
+            state = self.models[model]
+            # Latency is only recorded once a real completion was parsed
+            if response is None or client.latency_ms is None:
+                state.state = 'cold'
+                state.warmup_failures += 1
+                return
+            state.warmups += 1
+            self._touch(state, client.latency_ms)
+            # A one-token completion is only slow if the model had to be loaded
+            if client.latency_ms >= self.cold_load_ms:
+                state.cold_loads += 1
+
+        logger.info(f"Warmed up model {model} in {client.latency_ms} ms")
+
+    def record_request(self, model, latency_ms):
+        """Note a real completion, which keeps the model loaded as well"""
+        state = self.models.get(model)
+        if state is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            state.last_request = now
+            state.requests.append(now)
+            self._touch(state, latency_ms)
+
+    def _touch(self, state, latency_ms):
+        state.state = 'warm'
+        state.last_touch = time.monotonic()
+        state.last_latency_ms = latency_ms
+
+    def snapshot(self):
+        """Current per-model load state, for the metrics endpoint"""
+        now = time.monotonic()
+        with self._lock:
+            models = []
+            for state in self.models.values():
+                self._expire(state, now)
+                models.append({
+                    'model': state.model,
+                    'state': state.state,
+                    'idle_seconds': None if state.last_touch is None else int(now - state.last_touch),
+                    'last_latency_ms': state.last_latency_ms,
+                    'recent_requests': len(state.requests),
+                    'idle_ttl_seconds': int(self._idle_ttl(state, now)),
+                    'warmups': state.warmups,
+                    'warmup_failures': state.warmup_failures,
+                    'cold_loads': state.cold_loads,
+                })
+            return models
+
+
+scheduler = WarmupScheduler(
+    models=settings.LLM_HOT_MODELS,
+    keep_alive=settings.LLM_KEEP_ALIVE_SECONDS,
+    idle_ttl=settings.LLM_WARMUP_IDLE_TTL_SECONDS,
+    cold_load_ms=settings.LLM_COLD_LOAD_THRESHOLD_MS,
+)
+
+
+def start_warmup():
+    """Start the scheduler if LLM_WARMUP_ENABLED is set; called from the WSGI/ASGI entry points"""
+    if settings.LLM_WARMUP_ENABLED:
+        scheduler.start()
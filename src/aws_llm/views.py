@@ -2,16 +2,33 @@ from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework.exceptions import APIException
+from rest_framework.pagination import PageNumberPagination
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 import logging
-from drf_spectacular.utils import extend_schema, OpenApiExample
+import orjson
+from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiParameter
 from aws_llm.models import ChatConversation, ChatMessage
+from aws_llm.utils.batch import run_batch, save_batch
 from aws_llm.utils.llm_wrapper import AWSLLMWrapper
+from aws_llm.utils.usage import record_usage
+from aws_llm.utils.warmup import scheduler
 from aws_llm.serializers import (
+    BatchChatRequestSerializer,
+    BatchChatResponseSerializer,
     ChatConversationSerializer,
     ChatRequestSerializer, 
     ChatResponseSerializer, 
-    ErrorResponseSerializer
+    ChatSearchResponseSerializer,
+    ChatSearchResultSerializer,
+    ErrorResponseSerializer,
+    ModelStatusResponseSerializer,
+    SemanticCacheStatsResponseSerializer
 )
 
 logger = logging.getLogger(__name__)
@@ -83,16 +100,15 @@ class ChatResponseView(APIView):
             stream = request_serializer.validated_data.get('stream', False)
             
             # Initialize AWS LLM client
-            client = AWSLLMWrapper(model=model, stream=stream)
+            client = AWSLLMWrapper(model=model, stream=stream, use_cache=True)
             
-            # Get conversation history and convert to list format
-            message_queryset = ChatMessage.objects.filter(conversation=conversation).order_by('created_at')
-            messages = []
-            for msg in message_queryset:
-                messages.append({
-                    'role': msg.role,
-                    'content': msg.message
-                })
+            # Get conversation history as plain dicts, straight from the database
+            messages = list(
+                ChatMessage.objects
+                .filter(conversation=conversation)
+                .order_by('created_at')
+                .values('role', content=F('message'))
+            )
             
             # Add the new user message
             messages.append({
@@ -108,40 +124,49 @@ class ChatResponseView(APIView):
             else:
                 # Handle non-streaming response with history
                 response_generator = client.invoke_with_history(messages)
-                response_text = next(response_generator)
+                response_text = next(response_generator, None)
             
-            # Save the new user message to database
-            user_message = ChatMessage.objects.create(
-                conversation=conversation,
-                message=message,
-                role='user'
-            )
+            # The wrapper only records latency for a real completion
+            if client.latency_ms is None:
+                raise Exception("No valid response from upstream LLM")
             
-            # Save the assistant response to database
-            assistant_message = ChatMessage.objects.create(
-                conversation=conversation,
-                message=response_text,
-                role='assistant'
-            )
+            if not client.cache_hit:
+                scheduler.record_request(model, client.latency_ms)
+            usage = client.usage or {}
+            
+            with transaction.atomic():
+                # Save the new user message to database
+                ChatMessage.objects.create(
+                    conversation=conversation,
+                    message=message,
+                    role='user'
+                )
+                
+                # Save the assistant response to database
+                assistant_message = ChatMessage.objects.create(
+                    conversation=conversation,
+                    message=response_text,
+                    role='assistant',
+                    model=model,
+                    prompt_tokens=usage.get('prompt_tokens'),
+                    completion_tokens=usage.get('completion_tokens'),
+                    latency_ms=client.latency_ms
+                )
+                
+                # Cache hits cost no upstream tokens, so they stay out of the rollups
+                if not client.cache_hit:
+                    record_usage(conversation.user_id, [assistant_message])
             
-            # Create response data
+            # Server-generated data already matches ChatResponseSerializer, so it
+            # is rendered directly instead of being re-validated
             response_data = {
                 'response': response_text,
                 'model_used': model,
                 'timestamp': timezone.now(),
-                'success': True,
-                'conversation_id': conversation.id,
-                'user_message_id': user_message.id,
-                'assistant_message_id': assistant_message.id
+                'success': True
             }
             
-            # Validate response data
-            response_serializer = ChatResponseSerializer(data=response_data)
-            if response_serializer.is_valid():
-                return Response(response_serializer.data, status=status.HTTP_200_OK)
-            else:
-                logger.error(f"Response serialization failed: {response_serializer.errors}")
-                raise Exception("Response serialization failed")
+            return Response(response_data, status=status.HTTP_200_OK)
                 
         except Exception as e:
             logger.error(f"Error processing chat request: {str(e)}")
@@ -182,18 +207,14 @@ class ChatHistoryView(APIView):
             # Get specific conversation with user_id=1 and conversation_id=1
             conversation = ChatConversation.objects.get(id=1, user_id=1)
             
-            # Get all messages for this specific conversation
-            messages = ChatMessage.objects.filter(conversation=conversation).order_by('created_at')
-            
-            # Format messages for response
-            message_data = []
-            for msg in messages:
-                message_data.append({
-                    'id': msg.id,
-                    'role': msg.role,
-                    'content': msg.message,
-                    'timestamp': msg.created_at,
-                })
+            # Get all messages for this specific conversation, already shaped
+            # for the response so no model instances are built
+            message_data = list(
+                ChatMessage.objects
+                .filter(conversation=conversation)
+                .order_by('created_at')
+                .values('id', 'role', content=F('message'), timestamp=F('created_at'))
+            )
             
             # Format conversation data
             conversation_data = {
@@ -235,4 +256,298 @@ class ChatHistoryView(APIView):
             
             error_serializer = ErrorResponseSerializer(data=error_data)
             error_serializer.is_valid()
-            return Response(error_serializer.data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response(error_serializer.data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ChatSearchView(APIView):
+    """
+    REST API endpoint for full-text search across a user's chat history
+    """
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id='chat_search',
+        summary='Search chat history',
+        description='Full-text search over all messages of the requesting user, ranked by relevance',
+        parameters=[
+            OpenApiParameter('q', str, required=True, description='Search query (web search syntax: quotes, OR, -term)'),
+            OpenApiParameter('page', int, required=False, description='Page number of the results'),
+        ],
+        responses={
+            200: ChatSearchResponseSerializer,
+            400: ErrorResponseSerializer,
+            500: ErrorResponseSerializer,
+        },
+        tags=['Chat']
+    )
+    def get(self, request):
+        """
+        Handle GET requests for chat history search
+        Falls back to user_id=1 for anonymous requests, like the other chat endpoints
+        """
+        query_text = request.query_params.get('q', '').strip()
+
+        if not query_text:
+            error_serializer = ErrorResponseSerializer(data={
+                'error': 'Invalid request data',
+                'details': "Query parameter 'q' must be provided",
+                'timestamp': timezone.now()
+            })
+            error_serializer.is_valid()
+            return Response(error_serializer.data, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            user_id = request.user.id if request.user.is_authenticated else 1
+            query = SearchQuery(query_text, config='english', search_type='websearch')
+
+            # Matching goes through the GIN index on search_vector; the headline
+            # is only computed for the rows of the requested page
+            messages = (
+                ChatMessage.objects
+                .filter(conversation__user_id=user_id, search_vector=query)
+                .annotate(
+                    rank=SearchRank(F('search_vector'), query),
+                    snippet=SearchHeadline(
+                        'message',
+                        query,
+                        config='english',
+                        start_sel='<mark>',
+                        stop_sel='</mark>',
+                        max_fragments=2,
+                    ),
+                )
+                .order_by('-rank', '-created_at', '-id')
+            )
+
+            paginator = PageNumberPagination()
+            page = paginator.paginate_queryset(messages, request, view=self)
+            result_serializer = ChatSearchResultSerializer(page, many=True)
+            return paginator.get_paginated_response(result_serializer.data)
+
+        except APIException:
+            # e.g. NotFound for an invalid or out-of-range page, handled by DRF as a 404
+            raise
+
+        except Exception as e:
+            logger.error(f"Error searching chat history: {str(e)}")
+
+            error_data = {
+                'error': 'Internal server error',
+                'details': str(e),
+                'timestamp': timezone.now()
+            }
+
+            error_serializer = ErrorResponseSerializer(data=error_data)
+            error_serializer.is_valid()
+            return Response(error_serializer.data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+
+class ChatBatchView(APIView):
+    """
+    REST API endpoint that runs many prompts concurrently against the LLM
+    """
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id='chat_batch',
+        summary='Run a batch of prompts',
+        description=(
+            'Complete many prompts or conversations concurrently with one model. '
+            'Every successful item is stored as its own conversation. With stream=true '
+            'results are sent as newline-delimited JSON in completion order and are '
+            'stored once the whole batch has finished. With use_cache=true single-turn '
+            'prompts may be answered from the semantic prompt cache.'
+        ),
+        request=BatchChatRequestSerializer,
+        responses={
+            200: BatchChatResponseSerializer,
+            400: ErrorResponseSerializer,
+            500: ErrorResponseSerializer,
+        },
+        examples=[
+            OpenApiExample(
+                'Prompt Batch',
+                summary='Batch of single-turn prompts',
+                value={
+                    'prompts': ['Classify: "great product"', 'Classify: "never again"'],
+                    'model': 'gemma2:2b',
+                    'stream': False
+                },
+                request_only=True,
+            ),
+        ],
+        tags=['Chat']
+    )
+    def post(self, request):
+        """
+        Handle POST requests for batch chat responses
+        """
+        request_serializer = BatchChatRequestSerializer(data=request.data)
+
+        if not request_serializer.is_valid():
+            error_serializer = ErrorResponseSerializer(data={
+                'error': 'Invalid request data',
+                'details': request_serializer.errors,
+                'timestamp': timezone.now()
+            })
+            error_serializer.is_valid()
+            return Response(error_serializer.data, status=status.HTTP_400_BAD_REQUEST)
+
+        conversations = request_serializer.validated_data['conversations']
+        model = request_serializer.validated_data.get('model', 'gemma2:2b')
+        stream = request_serializer.validated_data.get('stream', False)
+        use_cache = request_serializer.validated_data.get('use_cache', False)
+        user_id = request.user.id if request.user.is_authenticated else 1
+
+        if stream:
+            response = StreamingHttpResponse(
+                self._stream_batch(user_id, model, conversations, use_cache),
+                content_type='application/x-ndjson'
+            )
+            response['X-Accel-Buffering'] = 'no'
+            return response
+
+        try:
+            results = {}
+            errors = {}
+            for index, result, error in run_batch(model, conversations, use_cache=use_cache):
+                if error is None:
+                    results[index] = result
+                else:
+                    logger.error(f"Batch item {index} failed: {error}")
+                    errors[index] = error
+
+            saved = save_batch(user_id, model, conversations, results)
+
+            result_data = []
+            for index in range(len(conversations)):
+                if index in saved:
+                    conversation, assistant_message = saved[index]
+                    result_data.append({
+                        'index': index,
+                        'success': True,
+                        'response': results[index]['response'],
+                        'cached': results[index].get('cached', False),
+                        'conversation_id': conversation.id,
+                        'assistant_message_id': assistant_message.id
+                    })
+                else:
+                    result_data.append({
+                        'index': index,
+                        'success': False,
+                        'error': errors[index]
+                    })
+
+            response_data = {
+                'results': result_data,
+                'model_used': model,
+                'timestamp': timezone.now(),
+                'success': not errors
+            }
+
+            return Response(response_data, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.error(f"Error processing batch chat request: {str(e)}")
+
+            error_data = {
+                'error': 'Internal server error',
+                'details': str(e),
+                'timestamp': timezone.now()
+            }
+
+            error_serializer = ErrorResponseSerializer(data=error_data)
+            error_serializer.is_valid()
+            return Response(error_serializer.data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def _stream_batch(self, user_id, model, conversations, use_cache):
+        """
+        Yield one JSON line per item as it completes, then store the batch.
+        Completed items are stored even if the client disconnects midway.
+        """
+        results = {}
+        items = run_batch(model, conversations, use_cache=use_cache)
+        try:
+            for index, result, error in items:
+                if error is None:
+                    results[index] = result
+                    line = {
+                        'index': index,
+                        'success': True,
+                        'response': result['response'],
+                        'cached': result.get('cached', False)
+                    }
+                else:
+                    logger.error(f"Batch item {index} failed: {error}")
+                    line = {'index': index, 'success': False, 'error': error}
+                yield orjson.dumps(line) + b'\n'
+        finally:
+            items.close()
+            try:
+                save_batch(user_id, model, conversations, results)
+            except Exception as e:
+                # Headers are already sent, so the failure can only be logged
+                logger.error(f"Error saving streamed batch: {str(e)}")
+
+
+
+class ModelStatusView(APIView):
+    """
+    REST API endpoint exposing the load state of the hot models
+    """
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id='model_status',
+        summary='Get model load state',
+        description='Load state and warm-up metrics of the configured hot models, as seen by this worker',
+        responses={
+            200: ModelStatusResponseSerializer,
+        },
+        tags=['Models']
+    )
+    def get(self, request):
+        """
+        Handle GET requests for model load state
+        """
+        response_data = {
+            'models': scheduler.snapshot(),
+            'timestamp': timezone.now()
+        }
+
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+
+class SemanticCacheStatsView(APIView):
+    """
+    REST API endpoint exposing semantic cache hit rates
+    """
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id='semantic_cache_stats',
+        summary='Get semantic cache statistics',
+        description='Per-model entry counts and hit rates of the semantic prompt cache in this worker',
+        responses={
+            200: SemanticCacheStatsResponseSerializer,
+        },
+        tags=['Models']
+    )
+    def get(self, request):
+        """
+        Handle GET requests for semantic cache statistics
+        """
+        models = []
+        if settings.SEMANTIC_CACHE_ENABLED:
+            from aws_llm.utils.semantic_cache import semantic_cache
+            models = semantic_cache.snapshot()
+
+        response_data = {
+            'enabled': settings.SEMANTIC_CACHE_ENABLED,
+            'models': models,
+            'timestamp': timezone.now()
+        }
+
+        return Response(response_data, status=status.HTTP_200_OK)
@@ -1,11 +1,18 @@
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import GoogleGenerativeAI
 from dotenv import load_dotenv
 
-load_dotenv()
 
-google_client = GoogleGenerativeAI(model="gemini-2.5-flash")
+def main():
+    # Imported here so importing this module doesn't pull in the LLM SDKs
+    from langchain_google_genai import GoogleGenerativeAI
 
-response = google_client.invoke("Hello, world!")
+    load_dotenv()
 
-print(response)
+    google_client = GoogleGenerativeAI(model="gemini-2.5-flash")
+
+    response = google_client.invoke("Hello, world!")
+
+    print(response)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_fallback_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for DRF's JSONRenderer backed by orjson.
+    Types orjson doesn't know natively (lazy strings, querysets, ...) go
+    through DRF's own encoder. orjson only indents by two spaces, so any
+    requested indent (e.g. from the browsable API) renders with two.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        # Same "...Z" suffix DRF's DateTimeField produces for UTC values, and
+        # integer keys as in ListField validation errors ({"prompts": {1: [...]}})
+        option = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=_fallback_encoder.default, option=option)
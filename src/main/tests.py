@@ -1,3 +1,46 @@
-from django.test import TestCase
+import orjson
+from django.test import SimpleTestCase
+from django.utils import timezone
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 
-# Create your tests here.
+from aws_llm.serializers import ErrorResponseSerializer
+from main.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_error_payload_with_integer_keys(self):
+        # ListField validation errors are keyed by the item's position
+        error_serializer = ErrorResponseSerializer(data={
+            'error': 'Invalid request data',
+            'details': {'prompts': {1: ['Ensure this field has no more than 4000 characters.']}},
+            'timestamp': timezone.now()
+        })
+        error_serializer.is_valid()
+
+        rendered = ORJSONRenderer().render(error_serializer.data)
+
+        self.assertEqual(orjson.loads(rendered), orjson.loads(JSONRenderer().render(error_serializer.data)))
+
+    def test_matches_drf_output_for_server_data(self):
+        data = {'response': 'héllo "x"', 'model_used': 'gemma2:2b', 'timestamp': timezone.now(), 'success': True}
+
+        self.assertEqual(orjson.loads(ORJSONRenderer().render(data)), {
+            'response': 'héllo "x"',
+            'model_used': 'gemma2:2b',
+            'timestamp': data['timestamp'].isoformat().replace('+00:00', 'Z'),
+            'success': True,
+        })
+
+    def test_none_renders_empty_body(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_indent_is_honoured(self):
+        data = {'a': [1, 2]}
+        self.assertEqual(ORJSONRenderer().render(data), b'{"a":[1,2]}')
+        self.assertIn(b'\n', ORJSONRenderer().render(data, 'application/json; indent=4'))
+        self.assertIn(b'\n', ORJSONRenderer().render(data, renderer_context={'indent': 4}))
+
+    def test_browsable_api_renders_through_it(self):
+        renderer = BrowsableAPIRenderer()
+        content = renderer.get_content(ORJSONRenderer(), {'a': 1}, 'application/json', {'indent': 4})
+        self.assertIn('\n', content)
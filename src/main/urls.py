@@ -1,13 +1,22 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+
+from main.views import lazy_view, prebuilt_schema
+
+if settings.COLD_START_MODE:
+    # Schema is built once at image build time; drf_spectacular is only
+    # imported if someone opens the docs
+    schema_view = prebuilt_schema
+else:
+    schema_view = lazy_view('drf_spectacular.views.SpectacularAPIView')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/aws-llm/', include('aws_llm.urls')),
     
     # Swagger/OpenAPI documentation
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+    path('api/schema/', schema_view, name='schema'),
+    path('api/docs/', lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema'), name='swagger-ui'),
+    path('api/redoc/', lazy_view('drf_spectacular.views.SpectacularRedocView', url_name='schema'), name='redoc'),
 ]
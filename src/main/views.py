@@ -1,3 +1,33 @@
-from django.shortcuts import render
+from importlib import import_module
 
-# Create your views here.
+from django.conf import settings
+from django.http import FileResponse, Http404
+
+
+def prebuilt_schema(request):
+    """
+    Serve the OpenAPI schema generated at build time
+    (`python manage.py spectacular --file ...`) instead of regenerating it
+    """
+    try:
+        schema_file = open(settings.OPENAPI_SCHEMA_FILE, 'rb')
+    except FileNotFoundError:
+        raise Http404("Prebuilt OpenAPI schema not found")
+    return FileResponse(schema_file, content_type='application/vnd.oai.openapi')
+
+
+def lazy_view(view_path, **initkwargs):
+    """
+    Return a view that imports `view_path` (a class-based view) on its first
+    request, so the module isn't loaded while the worker boots
+    """
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            module_path, class_name = view_path.rsplit('.', 1)
+            view = getattr(import_module(module_path), class_name).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return wrapper
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -35,6 +36,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'corsheaders',
     'rest_framework',
     'drf_spectacular',
@@ -118,13 +120,48 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cold start mode: serve the OpenAPI schema generated at build time
+# (`make schema-build`) instead of generating it in the worker. Building the
+# schema needs drf_spectacular's AutoSchema, so it must run with the flag off.
+COLD_START_MODE = os.getenv('COLD_START_MODE', '0') == '1'
+# Kept outside src/ so bind-mounting the sources doesn't hide the built file
+OPENAPI_SCHEMA_FILE = BASE_DIR.parent / 'openapi-schema.yml'
+
 # Django REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'main.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
 
+if COLD_START_MODE:
+    # @extend_schema resolves the schema class while views are imported; the
+    # workers never generate a schema, so skip loading drf_spectacular.openapi
+    REST_FRAMEWORK['DEFAULT_SCHEMA_CLASS'] = 'rest_framework.schemas.inspectors.ViewInspector'
+
+# Upper bound on concurrent upstream calls made by the batch chat endpoint
+BATCH_CHAT_MAX_WORKERS = int(os.getenv('BATCH_CHAT_MAX_WORKERS', '8'))
+
+# Upstream model warm-up: keeps LLM_HOT_MODELS loaded on the LLM server.
+# LLM_KEEP_ALIVE_SECONDS should match the server's unload timeout.
+LLM_WARMUP_ENABLED = os.getenv('LLM_WARMUP_ENABLED', '0') == '1'
+LLM_HOT_MODELS = [model for model in os.getenv('LLM_HOT_MODELS', 'gemma2:2b').split(',') if model]
+LLM_KEEP_ALIVE_SECONDS = int(os.getenv('LLM_KEEP_ALIVE_SECONDS', '300'))
+LLM_WARMUP_IDLE_TTL_SECONDS = int(os.getenv('LLM_WARMUP_IDLE_TTL_SECONDS', '3600'))
+LLM_COLD_LOAD_THRESHOLD_MS = int(os.getenv('LLM_COLD_LOAD_THRESHOLD_MS', '2000'))
+
+# Semantic prompt cache in front of the LLM (needs the `semantic-cache` extra).
+# Only conversations of up to SEMANTIC_CACHE_MAX_MESSAGES messages are cached.
+SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', '0') == '1'
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.95'))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', '2000'))
+SEMANTIC_CACHE_MAX_MESSAGES = int(os.getenv('SEMANTIC_CACHE_MAX_MESSAGES', '1'))
+SEMANTIC_CACHE_MAX_CHARS = int(os.getenv('SEMANTIC_CACHE_MAX_CHARS', '2000'))
+
 # drf-spectacular configuration
 SPECTACULAR_SETTINGS = {
     'TITLE': 'AI Chat API',